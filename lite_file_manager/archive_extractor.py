@@ -0,0 +1,191 @@
+import hashlib
+import os
+import shutil
+import tarfile
+import tempfile
+import zipfile
+import zlib
+from typing import Iterable, Optional, IO, Tuple
+
+from lite_file_manager import utils
+
+try:
+	import zstandard
+except ImportError:
+	zstandard = None
+
+ARCHIVE_SUFFIXES = ('.tar.gz', '.tar.zst', '.tgz', '.tzst', '.tar', '.zip')
+ZIP_MAGIC = (b'PK\x03\x04', b'PK\x05\x06')  # local file header, or end of central directory of an empty zip
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+COPY_BUFFER_SIZE = 2 ** 16
+BAD_ARCHIVE_ERRORS = (tarfile.TarError, zipfile.BadZipFile, zlib.error, EOFError) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+
+# raised when an archive cannot be extracted, translation_key is formatted with the archive name and translation_args
+class ExtractError(Exception):
+	def __init__(self, translation_key: str, *args):
+		super().__init__(translation_key, *args)
+		self.translation_key = translation_key
+		self.translation_args = args
+
+
+def strip_archive_suffix(file_name: str) -> str:
+	for suffix in ARCHIVE_SUFFIXES:
+		if file_name.lower().endswith(suffix) and len(file_name) > len(suffix):
+			return file_name[:-len(suffix)]
+	return file_name
+
+
+# a file-like object reading from the downloading chunks, counting and hashing every byte read
+class DownloadStream:
+	def __init__(self, chunks: Iterable[bytes], max_size: int):
+		self.__chunks = iter(chunks)
+		self.__max_size = max_size
+		self.__buffer = b''
+		self.__hasher = hashlib.sha256()
+		self.size = 0
+
+	def __fetch(self) -> bool:
+		for chunk in self.__chunks:
+			if chunk:
+				self.size += len(chunk)
+				if self.size > self.__max_size:
+					raise ExtractError('import.too_large', utils.pretty_file_size(self.__max_size))
+				self.__hasher.update(chunk)
+				self.__buffer += chunk
+				return True
+		return False
+
+	def peek(self, size: int) -> bytes:
+		while len(self.__buffer) < size and self.__fetch():
+			pass
+		return self.__buffer[:size]
+
+	def read(self, size: int = -1) -> bytes:
+		if size is None or size < 0:
+			while self.__fetch():
+				pass
+		elif len(self.__buffer) == 0:
+			self.__fetch()
+		if size is None or size < 0:
+			size = len(self.__buffer)
+		data, self.__buffer = self.__buffer[:size], self.__buffer[size:]
+		return data
+
+	def drain(self):
+		while self.__fetch():
+			self.__buffer = b''
+		self.__buffer = b''
+
+	def hexdigest(self) -> str:
+		return self.__hasher.hexdigest()
+
+
+class ArchiveExtractor:
+	def __init__(self, target_dir: str, max_entries: int, max_size: int):
+		self.target_dir = target_dir
+		self.max_entries = max_entries
+		self.max_size = max_size
+		self.entry_count = 0
+		self.total_size = 0
+
+	# an entry like "./" resolves to the target directory itself
+	def __resolve(self, name: str) -> str:
+		name = name.replace('\\', '/')
+		parts = [p for p in name.split('/') if p not in ('', '.')]
+		if name.startswith('/') or '..' in parts or (len(parts) > 0 and ':' in parts[0]):
+			raise ExtractError('import.extract.unsafe_path', name)
+		if len(parts) == 0:
+			return self.target_dir
+		path = os.path.join(self.target_dir, *parts)
+		root = os.path.realpath(self.target_dir)
+		if not os.path.realpath(path).startswith(root + os.sep):
+			raise ExtractError('import.extract.unsafe_path', name)
+		return path
+
+	def __count_entry(self):
+		self.entry_count += 1
+		if self.entry_count > self.max_entries:
+			raise ExtractError('import.extract.too_many_entries', self.max_entries)
+
+	def __make_dir(self, name: str):
+		os.makedirs(self.__resolve(name), exist_ok=True)
+
+	def __write_file(self, name: str, source: IO[bytes]):
+		path = self.__resolve(name)
+		if path == self.target_dir:
+			raise ExtractError('import.extract.unsafe_path', name)
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		with open(path, 'wb') as file_handler:
+			while True:
+				buf = source.read(COPY_BUFFER_SIZE)
+				if not buf:
+					break
+				# do not trust the size declared in the archive header
+				self.total_size += len(buf)
+				if self.total_size > self.max_size:
+					raise ExtractError('import.extract.too_large', utils.pretty_file_size(self.max_size))
+				file_handler.write(buf)
+
+	def __extract_tar(self, fileobj, mode: str):
+		with tarfile.open(fileobj=fileobj, mode=mode) as tar:
+			for member in tar:
+				self.__count_entry()
+				if member.isdir():
+					self.__make_dir(member.name)
+				elif member.isfile():
+					with tar.extractfile(member) as source:
+						self.__write_file(member.name, source)
+				# links and special files are skipped
+
+	def __extract_zip(self, stream: DownloadStream):
+		# zip keeps its central directory at the end of the archive, so the download needs to be spooled first
+		with tempfile.TemporaryFile() as spool:
+			while True:
+				buf = stream.read(COPY_BUFFER_SIZE)
+				if not buf:
+					break
+				spool.write(buf)
+			spool.seek(0)
+			with zipfile.ZipFile(spool) as archive:
+				for info in archive.infolist():
+					self.__count_entry()
+					if info.is_dir():
+						self.__make_dir(info.filename)
+					else:
+						with archive.open(info) as source:
+							self.__write_file(info.filename, source)
+
+	# the stream is fully consumed, so its hash is complete when this method returns
+	def extract(self, stream: DownloadStream):
+		os.makedirs(self.target_dir, exist_ok=True)
+		head = stream.peek(4)
+		try:
+			if head.startswith(ZIP_MAGIC):
+				self.__extract_zip(stream)
+			elif head.startswith(ZSTD_MAGIC):
+				if zstandard is None:
+					raise ExtractError('import.extract.zstd_unsupported')
+				with zstandard.ZstdDecompressor().stream_reader(stream, closefd=False) as reader:
+					self.__extract_tar(reader, 'r|')
+			else:
+				self.__extract_tar(stream, 'r|*')
+		except BAD_ARCHIVE_ERRORS as e:
+			raise ExtractError('import.extract.bad_archive', e)
+		stream.drain()
+
+
+# extract the archive into the staging directory, which is removed if anything goes wrong
+# return the entry count and the total uncompressed size
+def extract_archive(chunks: Iterable[bytes], staging_dir: str, sha256: Optional[str], max_download_size: int, max_entries: int, max_size: int) -> Tuple[int, int]:
+	shutil.rmtree(staging_dir, ignore_errors=True)  # leftover of a previous interrupted import
+	stream = DownloadStream(chunks, max_download_size)
+	extractor = ArchiveExtractor(staging_dir, max_entries, max_size)
+	try:
+		extractor.extract(stream)
+		if sha256 is not None and stream.hexdigest() != sha256.lower():
+			raise ExtractError('import.extract.hash_mismatch', stream.hexdigest())
+	except Exception:
+		shutil.rmtree(staging_dir, ignore_errors=True)
+		raise
+	return extractor.entry_count, extractor.total_size
@@ -7,7 +7,8 @@ from typing import Optional, Callable, Tuple, TYPE_CHECKING
 import requests
 from mcdreforged.api.all import *
 
-from lite_file_manager import file_uploader, utils, common
+from lite_file_manager import file_uploader, utils, common, archive_extractor
+from lite_file_manager.archive_extractor import ExtractError
 from lite_file_manager.common import tr
 
 if TYPE_CHECKING:
@@ -28,8 +29,10 @@ class AsyncWorker(ABC):
 	def _run_async(self, target: Callable, args: Tuple):
 		def task():
 			self.__working = True
-			target(*args)
-			self.__working = False
+			try:
+				target(*args)
+			finally:
+				self.__working = False
 		thread = threading.Thread(target=task, name=self.get_thread_name())
 		thread.setDaemon(True)
 		thread.start()
@@ -96,5 +99,39 @@ class FileImporter(AsyncWorker):
 				self._session.msg(tr('import.succeed', file_name, utils.pretty_file_size(total_size)))
 				shutil.move(temp_file_path, target_file_path)
 
+	def __import_archive(self, directory: str, url: str, dir_name: str, sha256: Optional[str]):
+		# staged next to the target, so the final rename stays on the same file system and is atomic
+		staging_dir_path = os.path.join(directory, '.lfm_extract#' + self._session.get_name() + '#' + dir_name)
+		target_dir_path = os.path.join(directory, dir_name)
+		try:
+			response = requests.get(url, stream=True)
+			entry_count, total_size = archive_extractor.extract_archive(
+				response.iter_content(chunk_size=4096), staging_dir_path, sha256,
+				max_download_size=common.config.max_import_size,
+				max_entries=common.config.max_extract_entries,
+				max_size=common.config.max_extract_size
+			)
+			# the target might have been created during the download. os.rename fails on an existing non-empty directory,
+			# but on posix it silently replaces an empty one, so check it first as well
+			if os.path.exists(target_dir_path):
+				raise ExtractError('import.extract.target_existed')
+			try:
+				os.rename(staging_dir_path, target_dir_path)
+			except OSError:
+				if os.path.exists(target_dir_path):
+					raise ExtractError('import.extract.target_existed')
+				raise
+		except ExtractError as e:
+			self._session.msg(tr(e.translation_key, dir_name, *e.translation_args))
+		except Exception as e:
+			self._session.msg(tr('import.failed', dir_name, e))
+		else:
+			self._session.msg(tr('import.extract.succeed', dir_name, entry_count, utils.pretty_file_size(total_size)))
+		finally:
+			shutil.rmtree(staging_dir_path, ignore_errors=True)
+
 	def import_file(self, directory: str, url: str, file_name: Optional[str]):
 		self._run_async(self.__import, (directory, url, file_name))
+
+	def import_archive(self, directory: str, url: str, dir_name: str, sha256: Optional[str]):
+		self._run_async(self.__import_archive, (directory, url, dir_name, sha256))
@@ -5,9 +5,11 @@ from mcdreforged.api.all import *
 if TYPE_CHECKING:
 	from lite_file_manager.config import Configure
 	from lite_file_manager.operation_logger import Logger
+	from lite_file_manager.structure_index import StructureIndex
 
 server_inst: PluginServerInterface
 action_logger: 'Logger'
+structure_index: 'StructureIndex'
 config: 'Configure'
 
 
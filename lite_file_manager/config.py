@@ -13,7 +13,10 @@ class DirectoryEntry(Serializable):
 class Configure(Serializable):
 	permission_requirement: int = 2
 	max_import_size: int = 10 * 2 ** 20  # 10MB
+	max_extract_entries: int = 1000
+	max_extract_size: int = 100 * 2 ** 20  # 100MB
 	file_per_page: int = 10
+	structure_info: bool = True
 	directories: Dict[str, DirectoryEntry] = {
 		'structures': DirectoryEntry(
 			path='./server/world/generated/minecraft/structures',
@@ -5,4 +5,5 @@ class OpType:
 
 PREFIX = '!!lfm'
 LOG_FILE = 'action_record.log'
+STRUCTURE_INDEX_FILE = 'structure_index.json'
 CONFIG_FILE = 'config.json'
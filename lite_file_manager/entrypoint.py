@@ -9,6 +9,7 @@ from lite_file_manager.common import tr
 from lite_file_manager.config import Configure
 from lite_file_manager.operation_logger import Logger
 from lite_file_manager.session import Session
+from lite_file_manager.structure_index import StructureIndex
 
 METADATA = None  # type: Optional[Metadata]
 sessions = {}  # type: Dict[str, Session]
@@ -69,6 +70,10 @@ def import_file(source: CommandSource, url: str, file_name: Optional[str]):
 	session_action(source, lambda s: s.import_file(url, file_name))
 
 
+def import_archive(source: CommandSource, url: str, dir_name: Optional[str], sha256: Optional[str]):
+	session_action(source, lambda s: s.import_file(url, dir_name, extract=True, sha256=sha256))
+
+
 def show_help(source: CommandSource):
 	help_msg_rtext = RTextList()
 	symbol = 0
@@ -91,6 +96,10 @@ def reload_config(source: Optional[CommandSource]):
 		global sessions
 		sessions.clear()
 		common.config = common.server_inst.load_config_simple(constants.CONFIG_FILE, target_class=Configure, source_to_reply=source)
+		if common.config.structure_info:
+			common.structure_index.start()
+		else:
+			common.structure_index.stop()
 	except Exception as e:
 		source.get_server().logger.error('Config reload failed ({})'.format(e))
 
@@ -100,11 +109,22 @@ def on_load(server: PluginServerInterface, old_inst):
 	METADATA = server.get_self_metadata()
 	common.server_inst = server
 	common.action_logger = Logger(server, os.path.join(server.get_data_folder(), constants.LOG_FILE))
+	common.structure_index = StructureIndex(server, os.path.join(server.get_data_folder(), constants.STRUCTURE_INDEX_FILE))
 	reload_config(None)
 	register_stuffs(server)
 
 
+def on_unload(server: PluginServerInterface):
+	common.structure_index.stop()
+
+
 def register_stuffs(server: PluginServerInterface):
+	def sha256_option(dir_name_getter: Callable[[dict], Optional[str]]) -> Literal:
+		return Literal('--sha256').then(
+			QuotableText('sha256').
+			runs(lambda src, ctx: import_archive(src, ctx['url'], dir_name_getter(ctx), ctx['sha256']))
+		)
+
 	server.register_command(
 		Literal(constants.PREFIX).
 		requires(lambda src: src.has_permission(common.config.permission_requirement)).
@@ -154,6 +174,19 @@ def register_stuffs(server: PluginServerInterface):
 			runs(lambda src, ctx: export_file(src, ctx['file_name']))
 		)).
 		then(Literal('import').then(
+				Literal('--extract').then(
+					QuotableText('url').
+					runs(lambda src, ctx: import_archive(src, ctx['url'], None, None)).
+					then(sha256_option(lambda ctx: None)).
+					then(
+						QuotableText('dir_name').
+						runs(lambda src, ctx: import_archive(src, ctx['url'], ctx['dir_name'], None)).
+						then(sha256_option(lambda ctx: ctx['dir_name']))
+					)
+				).
+				on_error(UnknownCommand, lambda src: src.reply(tr('command_hint.url')))
+			).
+			then(
 				QuotableText('url').
 				runs(lambda src, ctx: import_file(src, ctx['url'], None)).
 				then(
@@ -1,12 +1,14 @@
 import json
 import os
+import re
 from typing import Optional, List, Union, Dict, Callable, Any, Tuple
 
 from mcdreforged.api.all import *
 
-from lite_file_manager import constants, utils, common
+from lite_file_manager import constants, utils, common, archive_extractor
 from lite_file_manager.async_worker import FileExporter, FileImporter
 from lite_file_manager.common import tr
+from lite_file_manager.structure_index import StructureInfo
 
 
 class Session:
@@ -16,15 +18,23 @@ class Session:
 	ILLEGAL_CHARS = {'/', '\\', ':', '*', '?', '"', '|', '<', '>'}
 
 	class File:
-		def __init__(self, name: str, is_dir: bool, size: int):
+		def __init__(self, name: str, is_dir: bool, size: int, path: Optional[str] = None):
 			self.name = name
 			self.is_dir = is_dir
 			self.size = size
+			self.path = path
 
 		@property
 		def is_file(self) -> bool:
 			return not self.is_dir
 
+		# only looked up when the file is displayed, so files out of the current page are never queued for indexing
+		@property
+		def structure_info(self) -> Optional[StructureInfo]:
+			if self.is_file and self.path is not None and self.name.endswith('.nbt') and common.config.structure_info:
+				return common.structure_index.get(self.path)
+			return None
+
 	DIR_TO_UPPER_FILE = File(DIR_TO_UPPER, True, 0)
 
 	def __init__(self, source: CommandSource):
@@ -98,7 +108,17 @@ class Session:
 			fn = file.name
 			name_text = RText(fn if file.is_file else fn + '/', color_map[file.is_dir])
 			if file.is_file:
-				name_text.h(tr('session.ls.file_size', utils.pretty_file_size(file.size)))
+				hover_msg = RTextList(tr('session.ls.file_size', utils.pretty_file_size(file.size)))
+				info = file.structure_info
+				if info is not None:
+					hover_msg.append(
+						'\n', tr('session.ls.structure.size', ' × '.join(map(str, info.size))),
+						'\n', tr('session.ls.structure.block_count', info.block_count),
+						'\n', tr('session.ls.structure.entity_count', info.entity_count),
+						'\n', tr('session.ls.structure.palette_size', info.palette_size),
+						'\n', tr('session.ls.structure.data_version', info.data_version)
+					)
+				name_text.h(hover_msg)
 			else:
 				hover_msg = tr('session.ls.enter_dir', fn) if file != self.DIR_TO_UPPER_FILE else tr('session.ls.enter_parent')
 				name_text.h(hover_msg).c(RAction.run_command, '{} cd {}'.format(constants.PREFIX, json.dumps(fn)))
@@ -160,7 +180,7 @@ class Session:
 				ls_result = []
 			for name in ls_result:
 				full_path = os.path.join(cwd, name)
-				file_list.append(Session.File(name, os.path.isdir(full_path), os.path.getsize(full_path)))
+				file_list.append(Session.File(name, os.path.isdir(full_path), os.path.getsize(full_path), full_path))
 		if keyword is not None:
 			file_list = list(filter(lambda f: keyword in f.name, file_list))
 		self.__display_file_list(file_list, page)
@@ -268,10 +288,13 @@ class Session:
 		common.action_logger.log(self.source, 'export', file_name)
 		self.__do_something_with_file(file_name, something)
 
-	def import_file(self, url: str, file_name: Optional[str]):
+	def import_file(self, url: str, file_name: Optional[str], extract: bool = False, sha256: Optional[str] = None):
 		if not self.__ensure_writable():
 			return
-		common.action_logger.log(self.source, 'import', 'from {} as {}'.format(url, file_name))
+		common.action_logger.log(self.source, 'import', 'from {} as {}{}'.format(url, file_name, ' (extract)' if extract else ''))
+		if sha256 is not None and re.fullmatch(r'[0-9a-fA-F]{64}', sha256) is None:
+			self.msg(RText(tr('session.import.illegal_sha256', sha256), RColor.red))
+			return
 		if file_name is None or self.__check_file_name(file_name):
 			if self.__is_at_root():
 				self.msg(RText(tr('session.import.at_root'), RColor.red))
@@ -281,10 +304,14 @@ class Session:
 			else:
 				if file_name is None:
 					file_name = os.path.basename(url)
+					if extract:
+						file_name = archive_extractor.strip_archive_suffix(file_name)
 				self.msg(tr('session.import.message.0', url))
-				self.msg(tr('session.import.message.1', file_name))
+				self.msg(tr('session.import.message.1' if not extract else 'session.import.message.extract', file_name))
 				_dir = self.__get_current_real_dir()
 				if os.path.exists(os.path.join(_dir, file_name)):
-					self.msg(tr('session.import.file_existed'))
+					self.msg(tr('session.import.file_existed' if not extract else 'session.import.dir_existed'))
+				elif extract:
+					self.file_importer.import_archive(_dir, url, file_name, sha256)
 				else:
 					self.file_importer.import_file(_dir, url, file_name)
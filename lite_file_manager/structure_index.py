@@ -0,0 +1,246 @@
+import gzip
+import json
+import os
+import queue
+import struct
+import threading
+from typing import Optional, Dict, List, IO, Tuple
+
+from mcdreforged.api.all import *
+
+TAG_END = 0
+TAG_INT = 3
+TAG_STRING = 8
+TAG_LIST = 9
+TAG_COMPOUND = 10
+TAG_FIXED_SIZE = {1: 1, 2: 2, 3: 4, 4: 8, 5: 4, 6: 8}  # byte, short, int, long, float, double
+TAG_ARRAY_ITEM_SIZE = {7: 1, 11: 4, 12: 8}  # byte array, int array, long array
+SKIP_BUFFER_SIZE = 2 ** 16
+
+
+class StructureInfo(Serializable):
+	data_version: int = 0
+	size: List[int] = []
+	block_count: int = 0
+	entity_count: int = 0
+	palette_size: int = 0
+
+
+class IndexEntry(Serializable):
+	mtime: float
+	size: int
+	info: StructureInfo
+
+
+class NbtReader:
+	def __init__(self, stream: IO[bytes]):
+		self.__stream = stream
+
+	def read(self, size: int) -> bytes:
+		data = self.__stream.read(size)
+		if len(data) < size:
+			raise EOFError('Unexpected end of nbt data')
+		return data
+
+	def unpack(self, fmt: str):
+		return struct.unpack(fmt, self.read(struct.calcsize(fmt)))[0]
+
+	def skip(self, size: int):
+		while size > 0:
+			size -= len(self.read(min(size, SKIP_BUFFER_SIZE)))
+
+	def read_byte(self) -> int:
+		return self.unpack('>b')
+
+	def read_string(self) -> str:
+		return self.read(self.unpack('>H')).decode('utf8', errors='replace')
+
+	def read_list_header(self) -> Tuple[int, int]:
+		return self.read_byte(), self.unpack('>i')
+
+	def skip_list(self, item_type: int, length: int):
+		if item_type in TAG_FIXED_SIZE:
+			self.skip(TAG_FIXED_SIZE[item_type] * length)
+		else:
+			for _ in range(length):
+				self.skip_payload(item_type)
+
+	def skip_payload(self, tag_type: int):
+		if tag_type in TAG_FIXED_SIZE:
+			self.skip(TAG_FIXED_SIZE[tag_type])
+		elif tag_type in TAG_ARRAY_ITEM_SIZE:
+			self.skip(TAG_ARRAY_ITEM_SIZE[tag_type] * self.unpack('>i'))
+		elif tag_type == TAG_STRING:
+			self.skip(self.unpack('>H'))
+		elif tag_type == TAG_LIST:
+			self.skip_list(*self.read_list_header())
+		elif tag_type == TAG_COMPOUND:
+			while True:
+				child_type = self.read_byte()
+				if child_type == TAG_END:
+					break
+				self.skip(self.unpack('>H'))
+				self.skip_payload(child_type)
+		else:
+			raise ValueError('Unknown nbt tag type {}'.format(tag_type))
+
+
+# block, entity and palette lists are only counted and skipped, their content is never decoded
+def read_structure_info(file_path: str) -> StructureInfo:
+	info = StructureInfo()
+	with gzip.open(file_path, 'rb') as file:
+		reader = NbtReader(file)
+		if reader.read_byte() != TAG_COMPOUND:
+			raise ValueError('Root tag is not a compound')
+		reader.read_string()
+		while True:
+			tag_type = reader.read_byte()
+			if tag_type == TAG_END:
+				break
+			name = reader.read_string()
+			if tag_type == TAG_INT and name == 'DataVersion':
+				info.data_version = reader.unpack('>i')
+			elif tag_type == TAG_LIST and name == 'size':
+				item_type, length = reader.read_list_header()
+				if item_type == TAG_INT:
+					info.size = [reader.unpack('>i') for _ in range(length)]
+				else:
+					reader.skip_list(item_type, length)
+			elif tag_type == TAG_LIST and name in ('blocks', 'entities', 'palette'):
+				item_type, length = reader.read_list_header()
+				reader.skip_list(item_type, length)
+				if name == 'blocks':
+					info.block_count = length
+				elif name == 'entities':
+					info.entity_count = length
+				else:
+					info.palette_size = length
+			elif tag_type == TAG_LIST and name == 'palettes':
+				# multiple palettes only appear in shipwreck-like structures, they share the same size
+				item_type, length = reader.read_list_header()
+				if item_type == TAG_LIST and length > 0:
+					sub_item_type, sub_length = reader.read_list_header()
+					reader.skip_list(sub_item_type, sub_length)
+					info.palette_size = sub_length
+					length -= 1
+				reader.skip_list(item_type, length)
+			else:
+				reader.skip_payload(tag_type)
+	return info
+
+
+# a persistent cache of structure infos keyed by file path, validated with the file mtime and size
+# missing infos are parsed by a background worker, so listings never wait for parsing
+class StructureIndex:
+	def __init__(self, server: ServerInterface, index_file_path: str):
+		self.server = server
+		self.index_file_path = index_file_path
+		self.__lock = threading.Lock()
+		self.__entries = {}  # type: Dict[str, IndexEntry]
+		self.__failed = {}  # type: Dict[str, Tuple[float, int]]
+		self.__pending = set()
+		self.__queue = queue.Queue()
+		self.__thread = None  # type: Optional[threading.Thread]
+		self.__stop_event = threading.Event()
+
+	def load(self):
+		try:
+			with open(self.index_file_path, 'r', encoding='utf8') as file:
+				data = json.load(file)
+			entries = {path: IndexEntry.deserialize(entry) for path, entry in data.items() if os.path.isfile(path)}
+		except FileNotFoundError:
+			entries = {}
+		except Exception as e:
+			self.server.logger.warning('Fail to load structure index file "{}": {}'.format(self.index_file_path, e))
+			entries = {}
+		with self.__lock:
+			self.__entries = entries
+
+	def save(self):
+		with self.__lock:
+			data = {path: entry.serialize() for path, entry in self.__entries.items()}
+		try:
+			temp_file_path = self.index_file_path + '.tmp'
+			with open(temp_file_path, 'w', encoding='utf8') as file:
+				json.dump(data, file)
+			os.replace(temp_file_path, self.index_file_path)
+		except Exception as e:
+			self.server.logger.error('Fail to save structure index file "{}": {}'.format(self.index_file_path, e))
+
+	def is_running(self) -> bool:
+		return self.__thread is not None
+
+	def start(self):
+		if self.is_running():
+			return
+		self.load()
+		# every worker gets its own queue and stop flag, so a worker that outlives stop() cannot touch the new one
+		self.__queue = queue.Queue()
+		self.__stop_event = threading.Event()
+		self.__thread = threading.Thread(target=self.__work, args=(self.__queue, self.__stop_event), name='LFM structure indexer')
+		self.__thread.setDaemon(True)
+		self.__thread.start()
+
+	# join the worker before the final save, so an old instance never writes the index file after a plugin reload
+	def stop(self):
+		if self.__thread is None:
+			return
+		self.__stop_event.set()
+		while True:
+			try:
+				self.__queue.get_nowait()
+			except queue.Empty:
+				break
+		self.__queue.put(None)
+		self.__thread.join(timeout=5)
+		self.__thread = None
+		with self.__lock:
+			self.__pending.clear()
+		self.save()
+
+	# return None if the file is not indexed yet, and schedule it for parsing in the background
+	def get(self, file_path: str) -> Optional[StructureInfo]:
+		if not self.is_running():
+			return None
+		file_path = os.path.abspath(file_path)
+		try:
+			stat = os.stat(file_path)
+		except OSError:
+			return None
+		with self.__lock:
+			entry = self.__entries.get(file_path)
+			if entry is not None and entry.mtime == stat.st_mtime and entry.size == stat.st_size:
+				return entry.info
+			if self.__failed.get(file_path) == (stat.st_mtime, stat.st_size) or file_path in self.__pending:
+				return None
+			self.__pending.add(file_path)
+		self.__queue.put(file_path)
+		return None
+
+	def __index(self, file_path: str):
+		try:
+			stat = os.stat(file_path)
+		except OSError:
+			return
+		try:
+			info = read_structure_info(file_path)
+		except Exception as e:
+			self.server.logger.warning('Fail to read structure info from "{}": {}'.format(file_path, e))
+			with self.__lock:
+				self.__failed[file_path] = (stat.st_mtime, stat.st_size)
+				self.__entries.pop(file_path, None)
+		else:
+			with self.__lock:
+				self.__failed.pop(file_path, None)
+				self.__entries[file_path] = IndexEntry(mtime=stat.st_mtime, size=stat.st_size, info=info)
+
+	def __work(self, work_queue: queue.Queue, stop_event: threading.Event):
+		while True:
+			file_path = work_queue.get()
+			if file_path is None or stop_event.is_set():
+				break
+			self.__index(file_path)
+			with self.__lock:
+				self.__pending.discard(file_path)
+			if work_queue.empty() and not stop_event.is_set():
+				self.save()